@@ -5,3 +5,8 @@ WORDS = b"self None True False and as assert break class continue def del elif e
 
 ROOT_PATH = Path(os.path.dirname(os.path.dirname(__file__)))
 IMG_PATH = ROOT_PATH / 'SRC' / 'IMG'
+CACHE_PATH = Path.home() / '.superqsci' / 'cache'
+MAX_IMPORT_SUGGESTIONS = 10  # 自动导入菜单最多显示的条目数
+MAX_IMPORT_COMPLETIONS = 20  # 补全列表中最多合并的可导入名称数
+
+LONG_LINE_LENGTH = 5000  # 存在超过该长度的行时启用长行模式
@@ -0,0 +1,367 @@
+import ast
+import atexit
+import bisect
+import importlib
+import json
+import logging
+import os
+import site
+import sys
+import sysconfig
+import threading
+from importlib.machinery import EXTENSION_SUFFIXES
+
+from CONF.Constant import CACHE_PATH
+
+CACHE_VERSION = 3
+MAX_MODULE_SIZE = 1024 * 1024  # 超过该大小的模块不解析
+SKIP_DIRS = {'__pycache__', 'test', 'tests', 'site-packages', 'dist-packages', 'lib-dynload'}
+# 长后缀优先匹配，如 .abi3.so 先于 .so
+MODULE_SUFFIXES = sorted(EXTENSION_SUFFIXES, key=len, reverse=True) + ['.py']
+
+
+def getDynloadRoot() -> str:
+    """
+    获取标准库扩展模块（lib-dynload）所在目录，不存在时返回空字符串
+    """
+    for path in sys.path:
+        if os.path.basename(path) == 'lib-dynload' and os.path.isdir(path):
+            return os.path.normpath(path)
+    return ''
+
+
+def getSiteRoots() -> list:
+    """
+    获取标准库与已安装第三方库所在目录
+    """
+    roots = [sysconfig.get_paths().get('stdlib', ''), getDynloadRoot()]
+    try:
+        roots.extend(site.getsitepackages())
+    except AttributeError:
+        pass
+    roots.append(site.getusersitepackages())
+    return [os.path.normpath(root) for root in roots if root and os.path.isdir(root)]
+
+
+def getProjectRoot(file_path: str) -> str:
+    """
+    由文件路径向上查找项目根目录：跳过所有包含 __init__.py 的包目录
+    """
+    root = os.path.dirname(os.path.abspath(file_path))
+    while os.path.isfile(os.path.join(root, '__init__.py')):
+        parent = os.path.dirname(root)
+        if parent == root:
+            break
+        root = parent
+    return root
+
+
+def extractExports(source: str, module: str = '', is_package: bool = False) -> tuple:
+    """
+    通过 ast 提取模块导出的名称，存在字面量 __all__ 时以其为准
+    @param module: 模块名，用于判断包 __init__ 中的 from 导入是否来自本包
+    @param is_package: 是否为包的 __init__
+    @return: (模块内定义的名称, 包 __init__ 中从本包导入的再导出名称)
+    """
+    tree = ast.parse(source)
+    package = module.split('.')[0]
+    names, reexports = [], []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.append(node.name)
+        elif isinstance(node, ast.ImportFrom) and is_package:
+            if node.level > 0 or (node.module or '').split('.')[0] == package:
+                reexports.extend(alias.asname or alias.name for alias in node.names if alias.name != '*')
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                if target.id == '__all__' and isinstance(node.value, (ast.List, ast.Tuple)):
+                    try:
+                        return [name for name in ast.literal_eval(node.value) if isinstance(name, str)], []
+                    except ValueError:
+                        pass
+                names.append(target.id)
+    names = [name for name in names if not name.startswith('_')]
+    return names, [name for name in reexports if not name.startswith('_') and name not in names]
+
+
+def introspectExports(module: str) -> list:
+    """
+    导入模块并通过 dir 获取导出名称，仅用于内置模块与标准库扩展模块
+    """
+    exported = importlib.import_module(module)
+    names = getattr(exported, '__all__', None) or dir(exported)
+    return [name for name in names if isinstance(name, str) and not name.startswith('_')]
+
+
+class ModuleExportIndex:
+    """
+    模块导出名称索引：模块 -> 导出名称，后台线程构建，按文件 mtime 失效并缓存到磁盘，
+    输入过程中的查找只是一次字典命中
+    """
+
+    def __init__(self, cache_file=CACHE_PATH / 'module_exports.json'):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._files = dict()  # 文件路径 -> {"root", "mtime", "module", "names", "reexports"}
+        self._names = dict()  # 导出名称 -> [(优先级, 层级, 模块)]，已排序
+        self._sorted_names = []  # 排序后的导出名称与顶层模块名，用于前缀补全
+        self._modules = set()
+        self._roots = set()
+        self._dirty = False
+        self._builtin_entries = self._builtinEntries()
+        self._loadCache()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _builtinEntries():
+        entries = []
+        for module in sys.builtin_module_names:
+            if module.startswith('_'):
+                continue
+            try:
+                names = introspectExports(module)
+            except Exception as e:
+                logging.warning(f'{module}: {e!r}')
+                names = []
+            entries.append(dict(root='', mtime=0, module=module, names=names, reexports=[]))
+        return entries
+
+    def _loadCache(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self._files = data.get('files', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(e)
+        self._rebuildLookup()
+
+    def _saveCache(self):
+        try:
+            os.makedirs(self.cache_file.parent, exist_ok=True)
+            tmp_file = f'{self.cache_file}.tmp'
+            with self._lock:
+                data = json.dumps(dict(version=CACHE_VERSION, files=self._files))
+                self._dirty = False
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logging.warning(e)
+
+    def flush(self):
+        """
+        索引有改动时写回磁盘缓存，程序退出时自动调用
+        """
+        if self._dirty:
+            self._saveCache()
+
+    def _rebuildLookup(self):
+        # 模块内定义的名称优先于再导出的名称，其次顶层模块优先
+        ranked, modules = dict(), set()
+        for entry in self._builtin_entries + list(self._files.values()):
+            module = entry['module']
+            modules.add(module)
+            for rank, names in enumerate((entry['names'], entry['reexports'])):
+                for name in names:
+                    ranked.setdefault(name, []).append((rank, module.count('.'), module))
+        for candidates in ranked.values():
+            candidates.sort()
+        sorted_names = sorted(set(ranked) | {module for module in modules if '.' not in module})
+        self._names, self._sorted_names, self._modules = ranked, sorted_names, modules
+
+    def _addEntry(self, entry):
+        module = entry['module']
+        if module not in self._modules:
+            self._modules.add(module)
+            if '.' not in module:
+                self._addName(module)
+        for rank, names in enumerate((entry['names'], entry['reexports'])):
+            for name in names:
+                if name not in self._names:
+                    self._names[name] = []
+                    self._addName(name)
+                bisect.insort(self._names[name], (rank, module.count('.'), module))
+
+    def _removeEntry(self, entry):
+        module = entry['module']
+        for rank, names in enumerate((entry['names'], entry['reexports'])):
+            for name in names:
+                candidates = self._names.get(name)
+                if candidates and (rank, module.count('.'), module) in candidates:
+                    candidates.remove((rank, module.count('.'), module))
+
+    def _addName(self, name):
+        index = bisect.bisect_left(self._sorted_names, name)
+        if index == len(self._sorted_names) or self._sorted_names[index] != name:
+            self._sorted_names.insert(index, name)
+
+    def scan(self, roots):
+        """
+        在后台线程中扫描目录，跳过本次会话已扫描过的目录
+        """
+        roots = [os.path.normpath(root) for root in roots]
+        with self._lock:
+            roots = [root for root in roots if root not in self._roots]
+            self._roots.update(roots)
+        if roots:
+            threading.Thread(target=self._scanRoots, args=(roots,), daemon=True).start()
+
+    def _scanRoots(self, roots):
+        with self._scan_lock:
+            for root in roots:
+                try:
+                    self._scanRoot(root)
+                except Exception as e:
+                    logging.warning(e)
+            self.flush()
+
+    def _scanRoot(self, root):
+        with self._lock:
+            cached = {path: entry for path, entry in self._files.items() if entry['root'] == root}
+            other_roots = self._roots - {root}
+        scanned, changed = dict(), False
+        for dir_path, dir_names, file_names in os.walk(root):
+            dir_names[:] = [
+                name for name in dir_names
+                if name not in SKIP_DIRS and not name.startswith(('.', '_'))
+                and os.path.join(dir_path, name) not in other_roots
+                and os.path.isfile(os.path.join(dir_path, name, '__init__.py'))
+            ]
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                module = self._moduleName(root, path)
+                if module is None:
+                    continue
+                entry = cached.get(path)
+                try:
+                    mtime = os.stat(self._sourcePath(path)).st_mtime
+                except OSError:
+                    continue
+                if entry is None or entry['mtime'] != mtime:
+                    entry = self._parseEntry(root, path, module)
+                    changed = True
+                scanned[path] = entry
+
+        with self._lock:
+            if changed or len(scanned) != len(cached):
+                for path in cached:
+                    self._files.pop(path, None)
+                self._files.update(scanned)
+                self._dirty = True
+                self._rebuildLookup()
+
+    def update(self, path):
+        """
+        文件保存后仅重新解析该文件，更新对应条目与查找表，缓存延迟到退出时写回
+        """
+        path = os.path.normpath(os.path.abspath(path))
+        root = getProjectRoot(path)
+        module = self._moduleName(root, path)
+        with self._lock:
+            if root not in self._roots or module is None:
+                return
+        entry = self._parseEntry(root, path, module)
+        with self._lock:
+            old_entry = self._files.get(path)
+            if old_entry is not None:
+                self._removeEntry(old_entry)
+            self._files[path] = entry
+            self._addEntry(entry)
+            self._dirty = True
+
+    @staticmethod
+    def _sourcePath(path):
+        """
+        扩展模块存在 .pyi 存根时以存根为名称来源
+        """
+        if path.endswith('.py'):
+            return path
+        stub = f'{ModuleExportIndex._stripSuffix(path)}.pyi'
+        return stub if os.path.isfile(stub) else path
+
+    def _parseEntry(self, root, path, module):
+        source_path = self._sourcePath(path)
+        names, reexports, mtime = [], [], 0
+        try:
+            stat = os.stat(source_path)
+            mtime = stat.st_mtime
+            if source_path.endswith(('.py', '.pyi')):
+                if stat.st_size <= MAX_MODULE_SIZE:
+                    with open(source_path, 'r', encoding='utf-8') as f:
+                        is_package = os.path.basename(path) == '__init__.py'
+                        names, reexports = extractExports(f.read(), module, is_package)
+            elif root == getDynloadRoot():
+                # 无存根的标准库扩展模块，直接导入获取名称
+                names = introspectExports(module)
+        except SyntaxError:
+            pass
+        except Exception as e:
+            logging.warning(f'{path}: {e!r}')
+        # 无法解析的模块也记录 mtime，避免每次扫描重复解析
+        return dict(root=root, mtime=mtime, module=module, names=names, reexports=reexports)
+
+    @staticmethod
+    def _stripSuffix(path):
+        for suffix in MODULE_SUFFIXES:
+            if path.endswith(suffix):
+                return path[:-len(suffix)]
+        return None
+
+    @staticmethod
+    def _moduleName(root, path):
+        stem = ModuleExportIndex._stripSuffix(path)
+        if stem is None:
+            return None
+        parts = os.path.relpath(stem, root).split(os.sep)
+        if parts[-1] == '__init__' and path.endswith('.py'):
+            parts = parts[:-1]
+        elif parts[-1].startswith('_'):
+            return None
+        if not parts or not all(part.isidentifier() for part in parts):
+            return None
+        return '.'.join(parts)
+
+    def lookup(self, name: str) -> list:
+        """
+        查找可导入该名称的语句
+        @return: import 语句列表，顶层模块优先
+        """
+        if name in self._modules:
+            # 名称本身是顶层模块时，不再提示 from x import name 形式的再导出
+            return [f'import {name}']
+        return [f'from {module} import {name}' for *_, module in self._names.get(name, [])]
+
+    def complete(self, prefix: str, limit: int) -> list:
+        """
+        前缀补全：返回以 prefix 开头、可以被导入的名称
+        """
+        names = []
+        index = bisect.bisect_left(self._sorted_names, prefix)
+        while index < len(self._sorted_names) and len(names) < limit:
+            name = self._sorted_names[index]
+            if not name.startswith(prefix):
+                break
+            if name in self._modules or self._names.get(name):
+                names.append(name)
+            index += 1
+        return names
+
+
+_export_index = None
+
+
+def getExportIndex() -> ModuleExportIndex:
+    """
+    获取全局共享的模块导出索引
+    """
+    global _export_index
+    if _export_index is None:
+        _export_index = ModuleExportIndex()
+    return _export_index
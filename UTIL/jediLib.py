@@ -1,12 +1,18 @@
 import sys
+import builtins
 import jedi
+import parso
 
 from venv import logger
 
+# 模块隐式定义的属性
+MODULE_ATTRIBUTES = ("__file__", "__name__", "__doc__", "__spec__", "__loader__", "__package__", "__builtins__")
+
 
 class JdeiLib:
     def __init__(self, source, filename, project=None):
         self.filename = filename
+        self.source = source
         self.script = jedi.Script(source, path=filename, project=project)
 
     def getCallTips(self, line, index):
@@ -193,14 +199,53 @@ class JdeiLib:
 
         return response
 
-    def getImportSuggestions(self):
+    def getUnresolvedNames(self):
+        """
+        获取文件中引用了但未定义的名称（不做 jedi 推断）
+        @return: 名称列表，按首次出现顺序
+        """
         rets = []
         try:
-            names = self.script.get_names(all_scopes=True, definitions=False)
+            defined = {name.name for name in self.script.get_names(all_scopes=True, definitions=True)}
+            defined.update(dir(builtins))
+            defined.update(MODULE_ATTRIBUTES)
+            module = parso.parse(self.source)
+            names = self.script.get_names(all_scopes=True, definitions=False, references=True)
             for name in names:
-                if name.type == "name":
-                    rets.append(name.name)
+                if name.name in defined or name.name in rets:
+                    continue
+                leaf = module.get_leaf_for_position((name.line, name.column + 1))
+                if leaf is None or leaf.type != "name" or self._isNotFreeName(leaf):
+                    continue
+                rets.append(name.name)
         except Exception as e:
             logger.error(e)
 
         return rets
+
+    @staticmethod
+    def _isNotFreeName(leaf):
+        """
+        判断名称节点是否为属性访问 obj.name、关键字参数 func(name=...) 或 import 语句中的模块名
+        """
+        parent = leaf.parent
+        previous = leaf.get_previous_leaf()
+        if parent.type == "trailer" and previous is not None and previous.value == ".":
+            return True
+        if parent.type == "argument" and parent.children[0] is leaf and parent.children[1] == "=":
+            return True
+        return leaf.search_ancestor("import_from", "import_name") is not None
+
+    def getImportSuggestions(self, export_index):
+        """
+        为未定义的名称查找可插入的 import 语句
+        @param export_index: 模块导出索引 UTIL.importIndex.ModuleExportIndex
+        @return: 字典列表，包括名称与候选 import 语句
+        """
+        rets = []
+        for name in self.getUnresolvedNames():
+            statements = export_index.lookup(name)
+            if statements:
+                rets.append(dict(name=name, statements=statements))
+
+        return rets
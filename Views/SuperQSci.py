@@ -1,15 +1,19 @@
 import os
+import re
+import ast
 import logging
 import platform
 
 import autopep8
 from PyQt6 import Qsci
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QPoint, QTimer, pyqtSignal
 from PyQt6.Qsci import QsciScintilla, QsciAPIs
 from PyQt6.QtGui import QColor, QFont, QMouseEvent, QPainter, QPen, QKeyEvent, QShortcut, QKeySequence
+from qfluentwidgets import RoundMenu, Action
 
-from CONF.Constant import WORDS
+from CONF.Constant import WORDS, LONG_LINE_LENGTH, MAX_IMPORT_SUGGESTIONS, MAX_IMPORT_COMPLETIONS
 from UTIL.jediLib import JdeiLib
+from UTIL.importIndex import getExportIndex, getSiteRoots, getProjectRoot
 from CONF.LexerMaps import LEXER_MAPS
 
 
@@ -24,6 +28,9 @@ class SuperQSci(QsciScintilla):
         super().__init__(parent)
         self.underlined_word_range = None  # 记录下划线范围
         self.current_file_path = None
+        self.export_index = None  # 模块导出索引，仅 Python 文件启用
+        self.import_completions = set()  # 当前补全列表中来自模块导出索引的名称
+        self.max_line_length = 0  # 当前文件最长行的长度
         self._parent = parent
         self.initUi()
         self.initActions()
@@ -59,6 +66,9 @@ class SuperQSci(QsciScintilla):
         self.format_shortcut.activated.connect(self.reFormat)
         self.comment_shortcut = QShortcut(QKeySequence("Ctrl+Alt+C"), self)
         self.comment_shortcut.activated.connect(self.commentSelected)
+        self.import_shortcut = QShortcut(QKeySequence("Alt+Return"), self)
+        self.import_shortcut.activated.connect(self.showImportSuggestions)
+        self.SCN_AUTOCSELECTION.connect(self.onAutoCompleted)
 
     def setMargs(self):
         # 行号相关设置
@@ -200,16 +210,41 @@ class SuperQSci(QsciScintilla):
 
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
+                self.max_line_length = max(map(len, content.split('\n')))
+                # 需在 setText 之前关闭自动换行，否则会对整个超长行做换行布局
+                if self.isLongLineMode():
+                    self._configureLongLineMode()
                 self.setText(content)
         except Exception as e:
             print(f"未知错误: {e}")
 
         self._configureLexer(file_path)
         self.setMargs()
+        if self.isLongLineMode():
+            return
         self.setAutoCompletionSource(QsciScintilla.AutoCompletionSource.AcsAPIs)
         self.setAutoCompletionThreshold(1)  # 输入1个字符后触发补全
         self.textChanged.connect(self.showCompletion)
 
+        if os.path.splitext(file_path)[1].lower() == '.py':
+            self.export_index = getExportIndex()
+            self.export_index.scan(getSiteRoots() + [getProjectRoot(file_path)])
+
+    def isLongLineMode(self):
+        return self.max_line_length > LONG_LINE_LENGTH
+
+    def _configureLongLineMode(self):
+        """
+        长行模式（压缩后的 js/json 等）：关闭自动换行与折叠，可见区域之前的文本
+        在空闲时着色，跳转或滚动时不再同步分析整个前文。
+        词法分析器需保留：没有样式分段时 Scintilla 每次重绘都要重新测量整行宽度
+        """
+        self.setWrapMode(QsciScintilla.WrapMode.WrapNone)
+        self.setFolding(QsciScintilla.FoldStyle.NoFoldStyle)
+        self.setIndentationGuides(False)
+        self.SendScintilla(QsciScintilla.SCI_SETIDLESTYLING, QsciScintilla.SC_IDLESTYLING_TOVISIBLE)
+        self.SendScintilla(QsciScintilla.SCI_SETSCROLLWIDTHTRACKING, True)
+
     def _configureLexer(self, file_path):
         """
         根据文件扩展名配置对应语言的词法分析器，并设置高亮颜色 (PyCharm Light 主题)
@@ -235,6 +270,8 @@ class SuperQSci(QsciScintilla):
                 file.write(self.text())
                 if is_shortcut:
                     self.file_save.emit(self.current_file_path)
+            if self.export_index is not None:
+                self.export_index.update(self.current_file_path)
         except Exception as e:
             logging.warning(e)
         finally:
@@ -248,6 +285,9 @@ class SuperQSci(QsciScintilla):
         # 获取 Jedi 补全建议
         jedi_lib = JdeiLib(source=self.text(), filename=self.current_file_path)
         completions = jedi_lib.getCompletions(line=cursor_position[0] + 1, index=cursor_position[1])
+        # 合并模块导出索引中可导入的名称，选中后自动插入 import
+        self.import_completions = set(self.importCompletions(cursor_position, completions))
+        completions += sorted(self.import_completions)
 
         if completions:  # 确保补全列表有效
             self.apis.clear()  # 清空之前的补全项
@@ -259,6 +299,35 @@ class SuperQSci(QsciScintilla):
             print("No completions available.")
         self.textChanged.connect(self.showCompletion)
 
+    def importCompletions(self, cursor_position, completions):
+        """
+        光标前的标识符前缀可匹配模块导出索引时，返回 jedi 未提供的可导入名称
+        """
+        if self.export_index is None:
+            return []
+        line, index = cursor_position
+        code = self.text(line)[:index]
+        match = re.search(r'[A-Za-z_]\w*$', code)
+        # 属性访问与 import 语句中不提示
+        if match is None or code[:match.start()].rstrip().endswith('.') \
+                or code.lstrip().startswith(('import ', 'from ')):
+            return []
+        names = self.export_index.complete(match.group(), MAX_IMPORT_COMPLETIONS + len(completions))
+        return [name for name in names if name not in completions][:MAX_IMPORT_COMPLETIONS]
+
+    def onAutoCompleted(self, selection, position, ch, method):
+        """
+        选中的补全项来自模块导出索引时，插入排序最靠前的 import 语句
+        """
+        if isinstance(selection, bytes):
+            selection = selection.decode('utf-8')
+        if self.export_index is None or selection not in self.import_completions:
+            return
+        statements = self.export_index.lookup(selection)
+        if statements:
+            # 信号在补全文本插入之前发出，需等待插入完成后再修改文本
+            QTimer.singleShot(0, lambda: self.insertImport(statements[0]))
+
     def moveCursorVisible(self, line, index=0):
         if line:
             self.setCursorPosition(line - 1, index)
@@ -288,3 +357,73 @@ class SuperQSci(QsciScintilla):
             new_text = f"# {ori_text}" if not ori_text.startswith("#") else ori_text[2:]
             self.setSelection(line, 0, line, len(ori_text))
             self.replaceSelectedText(new_text)
+
+    def showImportSuggestions(self):
+        """
+        光标处单词（或文件中所有未定义名称）可由已安装/项目模块导入时，弹出导入菜单
+        """
+        if self.export_index is None:
+            return
+        line, index = self.getCursorPosition()
+        word = self.wordAtLineIndex(line, index)
+        jedi_lib = JdeiLib(source=self.text(), filename=self.current_file_path)
+        if word:
+            # 已定义或已导入的名称不再提示
+            statements = self.export_index.lookup(word) if word in jedi_lib.getUnresolvedNames() else []
+        else:
+            suggestions = jedi_lib.getImportSuggestions(self.export_index)
+            statements = [item['statements'][0] for item in suggestions]
+        statements = statements[:MAX_IMPORT_SUGGESTIONS]
+        if not statements:
+            return
+
+        menu = RoundMenu(parent=self)
+        for statement in statements:
+            menu.addAction(Action(statement, triggered=lambda checked=False, s=statement: self.insertImport(s)))
+        pos = self.SendScintilla(QsciScintilla.SCI_GETCURRENTPOS)
+        x = self.SendScintilla(QsciScintilla.SCI_POINTXFROMPOSITION, 0, pos)
+        y = self.SendScintilla(QsciScintilla.SCI_POINTYFROMPOSITION, 0, pos) + self.textHeight(line)
+        menu.exec(self.viewport().mapToGlobal(QPoint(x, y)))
+
+    @staticmethod
+    def _importInsertLine(source):
+        """
+        计算 import 语句的插入行：最后一条顶层 import 之后；没有 import 时
+        位于 shebang、编码声明与模块文档字符串之后
+        """
+        insert_line = 0
+        lines = source.split('\n')
+        if lines[0].startswith('#!'):
+            insert_line = 1
+        if len(lines) > insert_line and lines[insert_line].startswith('#') and 'coding' in lines[insert_line]:
+            insert_line += 1
+        try:
+            tree = ast.parse(source)
+        except Exception:
+            # 源码存在语法错误时无法定位 import 块
+            return insert_line
+        imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+        if imports:
+            return imports[-1].end_lineno
+        if tree.body and isinstance(tree.body[0], ast.Expr) and isinstance(tree.body[0].value, ast.Constant) \
+                and isinstance(tree.body[0].value.value, str):
+            return tree.body[0].end_lineno
+        return insert_line
+
+    def insertImport(self, statement):
+        """
+        将 import 语句插入到文件头部 import 块的末尾
+        """
+        lines = self.text().split('\n')
+        if statement in (line.strip() for line in lines):
+            return
+        insert_line = self._importInsertLine(self.text())
+        cursor_line, cursor_index = self.getCursorPosition()
+        if insert_line >= len(lines):
+            # 插入点位于没有换行结尾的最后一行之后
+            self.append(f'\n{statement}')
+        else:
+            self.insertAt(f'{statement}\n', insert_line, 0)
+        if cursor_line >= insert_line:
+            cursor_line += 1
+        self.setCursorPosition(cursor_line, cursor_index)
@@ -0,0 +1,94 @@
+"""
+长行模式滚动延迟基准：生成单行压缩 js 文件，用 SuperQSci 打开并统计滚动重绘耗时
+
+用法: python bench_scroll.py [--size-mb 50] [--steps 200] [--baseline]
+无显示环境下可设置 QT_QPA_PLATFORM=offscreen
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from PyQt6.Qsci import QsciScintilla
+from PyQt6.QtWidgets import QApplication
+
+import Views.SuperQSci as super_qsci
+
+CHUNK = 'function a{0}(b,c){{return b+c*{0}}};var d{0}=[1,2,"x{0}",{{k:null}}];'
+
+
+def makeMinifiedFile(size_mb):
+    path = os.path.join(tempfile.gettempdir(), f'bench_minified_{size_mb}mb.js')
+    size = size_mb * 1024 * 1024
+    if not os.path.exists(path) or os.path.getsize(path) < size:
+        with open(path, 'w', encoding='utf-8') as f:
+            written, number = 0, 0
+            while written < size:
+                chunk = CHUNK.format(number)
+                f.write(chunk)
+                written += len(chunk)
+                number += 1
+    return path
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) > 1 else samples[0]
+    print(f'{name:<16} mean {statistics.mean(samples):9.2f} ms   p95 {p95:9.2f} ms   max {samples[-1]:9.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=int, default=50)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--baseline', action='store_true', help='关闭长行模式，作为对照')
+    args = parser.parse_args()
+
+    if args.baseline:
+        super_qsci.LONG_LINE_LENGTH = sys.maxsize
+
+    app = QApplication(sys.argv)
+    path = makeMinifiedFile(args.size_mb)
+    editor = super_qsci.SuperQSci()
+    editor.resize(1200, 800)
+    editor.show()
+
+    def load():
+        editor.loadFile(path)
+        editor.viewport().repaint()
+        app.processEvents()
+
+    print(f'file: {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB), baseline={args.baseline}')
+    print(f'{"load":<16} {timed(load):9.2f} ms')
+
+    width = editor.viewport().width()
+    scroll = []
+    for step in range(args.steps):
+        scroll.append(timed(lambda: (
+            editor.SendScintilla(QsciScintilla.SCI_SETXOFFSET, (step + 1) * width // 4),
+            editor.viewport().repaint(),
+        )))
+    report('scroll right', scroll)
+
+    caret = []
+    for _ in range(args.steps):
+        caret.append(timed(lambda: (
+            editor.SendScintilla(QsciScintilla.SCI_CHARRIGHT),
+            editor.viewport().repaint(),
+        )))
+    report('caret right', caret)
+
+    print(f'{"jump to end":<16} {timed(lambda: (editor.SendScintilla(QsciScintilla.SCI_DOCUMENTEND), editor.viewport().repaint())):9.2f} ms')
+    print(f'{"jump to start":<16} {timed(lambda: (editor.SendScintilla(QsciScintilla.SCI_DOCUMENTSTART), editor.viewport().repaint())):9.2f} ms')
+
+
+if __name__ == '__main__':
+    main()